@@ -9,17 +9,33 @@ import sys
 import time
 import json
 import uuid
+import glob
+import hashlib
+import shutil
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import subprocess
 from pathlib import Path
 from datetime import datetime
 import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Use orjson for playlist JSON when available
+try:
+    import orjson
+    parse_json = orjson.loads
+except ImportError:
+    parse_json = json.loads
 
 # Try to import PyQt5 for GUI
 try:
-    from PyQt5.QtWidgets import QApplication, QLabel, QMainWindow
-    from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QObject
-    from PyQt5.QtGui import QPixmap, QMovie
+    from PyQt5.QtWidgets import (
+        QApplication, QLabel, QMainWindow, QFrame,
+        QGraphicsScene, QGraphicsView, QGraphicsPixmapItem, QOpenGLWidget
+    )
+    from PyQt5.QtCore import Qt, QTimer, QSize, pyqtSignal, QObject
+    from PyQt5.QtGui import QPixmap, QImage, QMovie, QPainter
     from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
     from PyQt5.QtMultimediaWidgets import QVideoWidget
     from PyQt5.QtCore import QUrl
@@ -28,6 +44,51 @@ except ImportError:
     PYQT_AVAILABLE = False
     print("PyQt5 not available, using fallback display mode")
 
+# Content downloads are copied from the socket in blocks of this size (bytes)
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Shared pool for downloading playlist content in parallel
+DOWNLOAD_WORKERS = 4
+download_executor = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS)
+
+# Seconds to wait before re-fetching a playlist whose downloads did not all succeed
+DOWNLOAD_RETRY_DELAY = 30
+
+# Returned by ServerCommunicator.get_content when the playlist hasn't changed
+UNCHANGED = object()
+
+
+def aspect_ratio_mode(display_mode):
+    """Map a content display_mode to the Qt aspect ratio mode used to scale it"""
+    if display_mode == 'fill':
+        # Scale to fill: crop content to fill screen (KeepAspectRatioByExpanding)
+        return Qt.KeepAspectRatioByExpanding
+    # Scale to fit: show black bars, no cropping (KeepAspectRatio)
+    return Qt.KeepAspectRatio
+
+
+def file_sha256(path):
+    """Return the hex SHA-256 of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def create_session():
+    """Create an HTTP session that keeps connections to the server alive"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=3, backoff_factor=0.5)
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
 class Config:
     """Configuration management"""
 
@@ -44,7 +105,9 @@ class Config:
             'location': '',
             'poll_interval': 30,  # seconds
             'heartbeat_interval': 60,  # seconds
-            'cache_dir': str(Path.home() / '.signage_cache')
+            'cache_dir': str(Path.home() / '.signage_cache'),
+            'cache_max_bytes': 10 * 1024 ** 3,  # 10 GiB
+            'opengl': True  # Render images through an OpenGL viewport
         }
 
         if os.path.exists(self.config_file):
@@ -88,43 +151,207 @@ class ContentManager:
         self.config = config
         self.cache_dir = Path(config.get('cache_dir'))
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = config.get('cache_max_bytes', 10 * 1024 ** 3)
+        self.session = create_session()
+        self._evict_lock = threading.Lock()
+        # Cache path -> lock held while that file is being written
+        self._path_locks = {}
+        self._path_locks_lock = threading.Lock()
+        # (width, height) images are pre-scaled to; set by the player
+        self.screen_size = None
 
     def get_content_path(self, content_id, filename):
         """Get local path for cached content"""
         return self.cache_dir / f"{content_id}_{filename}"
 
+    def scaled_path(self, local_path, display_mode, size):
+        """Get local path for an image pre-scaled to `size`"""
+        width, height = size
+        return Path(f"{local_path}.{width}x{height}.{display_mode}.scaled.png")
+
+    def prescale_image(self, local_path, display_mode, size):
+        """Save a copy of an image scaled to `size`, so showing it needs no resampling"""
+        scaled_path = self.scaled_path(local_path, display_mode, size)
+        with self._lock_for(scaled_path):
+            return self._prescale_image(local_path, display_mode, size, scaled_path)
+
+    def _prescale_image(self, local_path, display_mode, size, scaled_path):
+        if scaled_path.exists():
+            return str(scaled_path)
+
+        # QImage (unlike QPixmap) is safe to use off the GUI thread
+        image = QImage(str(local_path))
+        if image.isNull():
+            return None
+
+        scaled = image.scaled(QSize(*size), aspect_ratio_mode(display_mode), Qt.SmoothTransformation)
+        tmp_path = scaled_path.with_name(scaled_path.name + '.part')
+        if not scaled.save(str(tmp_path), 'PNG'):
+            tmp_path.unlink(missing_ok=True)
+            return None
+        os.replace(tmp_path, scaled_path)
+        return str(scaled_path)
+
+    def decode_image(self, local_path, display_mode, size):
+        """Load an image ready to display at `size`, preferring its pre-scaled copy"""
+        scaled_path = self.scaled_path(local_path, display_mode, size)
+        if scaled_path.exists():
+            return QImage(str(scaled_path))
+
+        image = QImage(str(local_path))
+        if image.isNull():
+            return image
+        return image.scaled(QSize(*size), aspect_ratio_mode(display_mode), Qt.SmoothTransformation)
+
     def download_content(self, content):
-        """Download content if not cached"""
-        content_id = content['id']
-        filename = content['file_path']
+        """Download content if not cached, pre-scaling images for the screen"""
+        local_path = self.fetch_file(content)
+
+        if local_path and content['content_type'] == 'image' and PYQT_AVAILABLE and self.screen_size:
+            try:
+                self.prescale_image(local_path, content.get('display_mode', 'fit'), self.screen_size)
+            except Exception as e:
+                print(f"Error pre-scaling image: {e}")
+
+        return local_path
 
-        local_path = self.get_content_path(content_id, filename)
+    def fetch_file(self, content):
+        """Download a content file if not cached"""
+        local_path = self.get_content_path(content['id'], content['file_path'])
+        # Playlist loads can overlap (event stream and fallback poll); a second
+        # caller waits for the running download and then finds the file cached
+        with self._lock_for(local_path):
+            return self._fetch_file(content, local_path)
 
-        # Check if already cached
+    def _fetch_file(self, content, local_path):
+        filename = content['file_path']
+        tmp_path = local_path.with_name(local_path.name + '.part')
+        etag_path = local_path.with_name(local_path.name + '.etag')
+        checksum_path = local_path.with_name(local_path.name + '.sha256')
+        checksum = content.get('checksum')
+
+        # Cached copies are checked against the checksum in the playlist when
+        # the server sends one, otherwise revalidated by ETag
+        headers = {}
         if local_path.exists():
-            return str(local_path)
+            if checksum:
+                if self._cached_checksum(local_path, checksum_path) == checksum:
+                    return self._cache_hit(local_path)
+                print(f"Cached copy is out of date: {content['name']}")
+            elif etag_path.exists():
+                headers['If-None-Match'] = etag_path.read_text().strip()
+            else:
+                return self._cache_hit(local_path)
 
         # Download from server
         try:
             server_url = self.config.get('server_url')
-            download_url = f"{server_url}/api/content/{content_id}/download"
+            # Immutable, long-cached URL that nginx can serve straight from disk
+            download_url = f"{server_url}/media/{filename}"
+
+            with self.session.get(download_url, headers=headers, stream=True, timeout=30) as response:
+                if response.status_code == 304:
+                    return self._cache_hit(local_path)
+                response.raise_for_status()
+
+                print(f"Downloading content: {content['name']}")
+
+                # Copy straight from the raw stream rather than iter_content,
+                # letting urllib3 undo any content encoding as it reads.
+                # Write to a .part file so an interrupted download never
+                # leaves a truncated file at the cached path.
+                response.raw.decode_content = True
+                with open(tmp_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+                etag = response.headers.get('ETag')
+
+            if checksum and file_sha256(tmp_path) != checksum:
+                raise ValueError(f"checksum mismatch for {filename}")
+            os.replace(tmp_path, local_path)
+
+            if checksum:
+                checksum_path.write_text(checksum)
+            else:
+                checksum_path.unlink(missing_ok=True)
 
-            print(f"Downloading content: {content['name']}")
+            # Scaled copies of the previous version are now stale
+            for stale in self.cache_dir.glob(glob.escape(local_path.name) + '.*.scaled.png'):
+                stale.unlink(missing_ok=True)
 
-            response = requests.get(download_url, stream=True, timeout=30)
-            response.raise_for_status()
-
-            with open(local_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            if etag:
+                etag_path.write_text(etag)
+            else:
+                etag_path.unlink(missing_ok=True)
 
             print(f"Downloaded: {local_path}")
+            self._evict_if_needed(keep=local_path)
             return str(local_path)
 
         except Exception as e:
             print(f"Error downloading content: {e}")
+            tmp_path.unlink(missing_ok=True)
+            # Fall back to a previously cached copy if we have one
+            if local_path.exists():
+                return self._cache_hit(local_path)
             return None
 
+    def _lock_for(self, path):
+        """Lock serializing writers of one cache file"""
+        with self._path_locks_lock:
+            return self._path_locks.setdefault(str(path), threading.Lock())
+
+    def _cached_checksum(self, local_path, checksum_path):
+        """Get a cached file's SHA-256, hashing it only if no sidecar exists yet"""
+        if checksum_path.exists():
+            return checksum_path.read_text().strip()
+
+        checksum = file_sha256(local_path)
+        checksum_path.write_text(checksum)
+        return checksum
+
+    def _cache_hit(self, local_path):
+        """Mark a cached file as recently used and return its path"""
+        # Touch explicitly rather than relying on atime, which is often
+        # disabled or coarse (noatime/relatime mounts)
+        os.utime(local_path)
+        return str(local_path)
+
+    def _evict_if_needed(self, keep=None):
+        """Delete least recently used files until the cache fits max_bytes"""
+        with self._evict_lock:
+            # Cached files are named "<id>_<uuid>.<ext>"; anything after a
+            # second dot (.etag, .part, scaled copies) belongs to that file
+            entries = {}
+            for path in self.cache_dir.iterdir():
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                owner = '.'.join(path.name.split('.')[:2])
+                entry = entries.setdefault(owner, {'atime': None, 'size': 0, 'paths': []})
+                if path.name == owner:
+                    entry['atime'] = stat.st_atime
+                entry['size'] += stat.st_size
+                entry['paths'].append(path)
+
+            total = sum(entry['size'] for entry in entries.values())
+
+            # Groups without their main file are downloads still in flight
+            candidates = sorted(
+                ((owner, entry) for owner, entry in entries.items()
+                 if entry['atime'] is not None and self.cache_dir / owner != keep),
+                key=lambda candidate: candidate[1]['atime']
+            )
+
+            for owner, entry in candidates:
+                if total <= self.max_bytes:
+                    break
+
+                print(f"Evicting cached content: {owner}")
+                for path in entry['paths']:
+                    path.unlink(missing_ok=True)
+                total -= entry['size']
+
 
 class ServerCommunicator:
     """Handles communication with the server"""
@@ -133,6 +360,8 @@ class ServerCommunicator:
         self.config = config
         self.server_url = config.get('server_url')
         self.identifier = config.get('identifier')
+        self.session = create_session()
+        self._etag = None
 
     def register(self):
         """Register this screen with the server"""
@@ -144,7 +373,7 @@ class ServerCommunicator:
                 'location': self.config.get('location')
             }
 
-            response = requests.post(url, json=data, timeout=10)
+            response = self.session.post(url, json=data, timeout=10)
             response.raise_for_status()
 
             print(f"Registered with server: {self.config.get('name')}")
@@ -158,7 +387,7 @@ class ServerCommunicator:
         """Send heartbeat to server"""
         try:
             url = f"{self.server_url}/api/screen/{self.identifier}/heartbeat"
-            response = requests.post(url, timeout=10)
+            response = self.session.post(url, timeout=10)
             response.raise_for_status()
             return True
         except Exception as e:
@@ -166,23 +395,50 @@ class ServerCommunicator:
             return False
 
     def get_content(self):
-        """Get assigned content from server"""
+        """Get assigned content from server, or UNCHANGED if it hasn't changed"""
         try:
             url = f"{self.server_url}/api/screen/{self.identifier}/content"
-            response = requests.get(url, timeout=10)
+            headers = {'If-None-Match': self._etag} if self._etag else {}
+            response = self.session.get(url, headers=headers, timeout=10)
+            if response.status_code == 304:
+                return UNCHANGED
             response.raise_for_status()
 
-            data = response.json()
+            data = parse_json(response.content)
+            self._etag = response.headers.get('ETag')
             return data
 
         except Exception as e:
             print(f"Error getting content: {e}")
             return None
 
+    def stream_events(self):
+        """Yield playlist payloads pushed by the server as Server-Sent Events"""
+        url = f"{self.server_url}/api/screen/{self.identifier}/events"
+        headers = {'Accept': 'text/event-stream'}
+
+        # The server sends a keep-alive comment every 30s, so a read
+        # timeout well above that only trips on a dead connection
+        with self.session.get(url, headers=headers, stream=True, timeout=(10, 90)) as response:
+            response.raise_for_status()
+
+            # chunk_size=None hands lines over as soon as each chunk arrives
+            data_lines = []
+            for line in response.iter_lines(chunk_size=None):
+                line = line.decode('utf-8')
+                if line.startswith('data:'):
+                    data_lines.append(line[5:].lstrip())
+                elif not line and data_lines:
+                    yield parse_json('\n'.join(data_lines))
+                    data_lines = []
+
 
 class SignalEmitter(QObject):
     """Signal emitter for thread-safe GUI updates"""
     content_updated = pyqtSignal(list)
+    event_stream_changed = pyqtSignal(bool)
+    image_decoded = pyqtSignal(str, QImage)
+    retry_requested = pyqtSignal()
 
 
 class SignagePlayer(QMainWindow):
@@ -196,32 +452,73 @@ class SignagePlayer(QMainWindow):
         self.current_playlist = []
         self.current_index = 0
 
+        # Display handler for each content type
+        self._handlers = {
+            'image': self.show_image,
+            'video': self.show_video,
+            'webpage': self.show_webpage
+        }
+
         # Signal emitter for thread-safe updates
         self.signal_emitter = SignalEmitter()
         self.signal_emitter.content_updated.connect(self.update_playlist)
+        self.signal_emitter.event_stream_changed.connect(self.on_event_stream_changed)
+        self.signal_emitter.image_decoded.connect(self.on_image_decoded)
+        self.signal_emitter.retry_requested.connect(self.schedule_retry)
+
+        # Upcoming images decoded off the GUI thread, keyed by scaled path
+        self._decoded = {}
+
+        # Images are pre-scaled for the current window size; re-run that
+        # (debounced) whenever the window is resized
+        self.prescale_timer = QTimer(self)
+        self.prescale_timer.setSingleShot(True)
+        self.prescale_timer.timeout.connect(self.prescale_playlist)
+
+        # Re-fetches the playlist after a download failed; restarting it
+        # while pending keeps to a single retry
+        self.retry_timer = QTimer(self)
+        self.retry_timer.setSingleShot(True)
+        self.retry_timer.timeout.connect(self.fetch_content)
 
         self.init_ui()
-        self.start_background_tasks()
 
         # Register with server
         self.server_comm.register()
 
-        # Initial content fetch
-        self.fetch_content()
+        # The content event stream delivers the initial playlist
+        self.start_background_tasks()
 
     def init_ui(self):
         """Initialize the user interface"""
         self.setWindowTitle('Digital Signage Player')
-        self.showFullScreen()
         self.setCursor(Qt.BlankCursor)  # Hide cursor
 
-        # Main label for images
+        # Main label for text messages
         self.image_label = QLabel(self)
         self.image_label.setAlignment(Qt.AlignCenter)
         self.image_label.setStyleSheet("background-color: black;")
         self.image_label.setScaledContents(True)
         self.setCentralWidget(self.image_label)
 
+        # Images are drawn as a textured quad, so scaling to the window
+        # happens on the GPU rather than in a CPU-side pixmap copy
+        self.image_scene = QGraphicsScene(self)
+        self.pixmap_item = QGraphicsPixmapItem()
+        self.pixmap_item.setTransformationMode(Qt.SmoothTransformation)
+        self.image_scene.addItem(self.pixmap_item)
+
+        self.image_view = QGraphicsView(self.image_scene, self)
+        if self.config.get('opengl', True):
+            self.image_view.setViewport(QOpenGLWidget())
+        self.image_view.setRenderHint(QPainter.SmoothPixmapTransform)
+        self.image_view.setBackgroundBrush(Qt.black)
+        self.image_view.setFrameShape(QFrame.NoFrame)
+        self.image_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.image_view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.image_view.hide()
+        self.image_aspect_mode = Qt.KeepAspectRatio
+
         # Video player (hidden by default)
         self.video_widget = QVideoWidget(self)
         self.video_widget.hide()
@@ -233,55 +530,110 @@ class SignagePlayer(QMainWindow):
         self.display_timer = QTimer()
         self.display_timer.timeout.connect(self.show_next_content)
 
+        self.showFullScreen()
+
     def start_background_tasks(self):
-        """Start background threads for server communication"""
-        # Heartbeat thread
-        def heartbeat_loop():
-            while True:
-                time.sleep(self.config.get('heartbeat_interval', 60))
-                self.server_comm.send_heartbeat()
+        """Start timers and the event stream thread for server communication"""
+        # Heartbeats are scheduled on the Qt event loop; each one is sent
+        # from a short-lived thread so the GUI never blocks on the socket
+        self.heartbeat_timer = QTimer(self)
+        self.heartbeat_timer.timeout.connect(
+            lambda: threading.Thread(target=self.server_comm.send_heartbeat, daemon=True).start()
+        )
+        self.heartbeat_timer.start(self.config.get('heartbeat_interval', 60) * 1000)
 
-        heartbeat_thread = threading.Thread(target=heartbeat_loop, daemon=True)
-        heartbeat_thread.start()
+        # Content polling timer, only running while the event stream is down
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.fetch_content)
 
-        # Content polling thread
-        def content_poll_loop():
+        # Content event thread: playlist changes are pushed by the server.
+        # The stream blocks on its socket, so it needs its own thread.
+        def content_event_loop():
             while True:
+                try:
+                    for data in self.server_comm.stream_events():
+                        self.signal_emitter.event_stream_changed.emit(True)
+                        self.load_playlist(data)
+                except Exception as e:
+                    print(f"Content event stream unavailable: {e}")
+
+                self.signal_emitter.event_stream_changed.emit(False)
                 time.sleep(self.config.get('poll_interval', 30))
-                self.fetch_content()
 
-        poll_thread = threading.Thread(target=content_poll_loop, daemon=True)
-        poll_thread.start()
+        event_thread = threading.Thread(target=content_event_loop, daemon=True)
+        event_thread.start()
+
+    def on_event_stream_changed(self, connected):
+        """Poll for content only while the event stream is unavailable"""
+        if connected:
+            self.poll_timer.stop()
+        elif not self.poll_timer.isActive():
+            self.fetch_content()
+            self.poll_timer.start(self.config.get('poll_interval', 30) * 1000)
 
     def fetch_content(self):
         """Fetch content from server in background"""
         def fetch():
             data = self.server_comm.get_content()
-            if data and data.get('items'):
-                items = data['items']
-                # Download all content
-                playlist = []
-                for item in items:
-                    content = item['content']
-                    if content['content_type'] in ['image', 'video']:
-                        local_path = self.content_manager.download_content(content)
-                        if local_path:
-                            content['local_path'] = local_path
-                            playlist.append(content)
-                    elif content['content_type'] == 'webpage':
-                        playlist.append(content)
-
-                if playlist:
-                    self.signal_emitter.content_updated.emit(playlist)
+            if data is not UNCHANGED:
+                self.load_playlist(data)
 
         fetch_thread = threading.Thread(target=fetch, daemon=True)
         fetch_thread.start()
 
+    def schedule_retry(self):
+        """Re-fetch the playlist shortly (called from main thread)"""
+        self.retry_timer.start(DOWNLOAD_RETRY_DELAY * 1000)
+
+    def load_playlist(self, data):
+        """Download the content in a playlist payload and hand it to the GUI
+
+        Returns False if any media item could not be downloaded
+        """
+        complete = True
+        if data and data.get('items'):
+            contents = [item['content'] for item in data['items']]
+
+            # Interned so handler lookups on every display tick compare by identity
+            for content in contents:
+                content['content_type'] = sys.intern(content['content_type'])
+
+            # Download media concurrently, once per content id so
+            # repeated items never race on the same cache file
+            media = {c['id']: c for c in contents if c['content_type'] in ['image', 'video']}
+            local_paths = dict(zip(
+                media,
+                download_executor.map(self.content_manager.download_content, media.values())
+            ))
+
+            if not all(local_paths.values()):
+                # Forget the ETag so the retry gets the full playlist instead
+                # of a 304, whether or not the event stream is connected
+                complete = False
+                self.server_comm._etag = None
+                self.signal_emitter.retry_requested.emit()
+
+            playlist = []
+            for content in contents:
+                if content['content_type'] in ['image', 'video']:
+                    local_path = local_paths[content['id']]
+                    if local_path:
+                        content['local_path'] = local_path
+                        playlist.append(content)
+                elif content['content_type'] == 'webpage':
+                    playlist.append(content)
+
+            if playlist:
+                self.signal_emitter.content_updated.emit(playlist)
+
+        return complete
+
     def update_playlist(self, playlist):
         """Update the current playlist (called from main thread)"""
         print(f"Playlist updated with {len(playlist)} items")
         self.current_playlist = playlist
         self.current_index = 0
+        self._decoded.clear()
 
         # Stop current playback and start new playlist
         self.display_timer.stop()
@@ -301,38 +653,65 @@ class SignagePlayer(QMainWindow):
 
         print(f"Displaying: {content['name']} ({content['content_type']})")
 
-        if content['content_type'] == 'image':
-            self.show_image(content)
-        elif content['content_type'] == 'video':
-            self.show_video(content)
-        elif content['content_type'] == 'webpage':
-            self.show_webpage(content)
+        handler = self._handlers.get(content['content_type'])
+        if handler:
+            handler(content)
 
-        # Move to next item
+        # Move to next item, decoding it in the background while this one shows
         self.current_index = (self.current_index + 1) % len(self.current_playlist)
+        next_content = self.current_playlist[self.current_index]
+        if next_content['content_type'] == 'image':
+            self.predecode_image(next_content)
+
+    def predecode_image(self, content):
+        """Decode an upcoming image on a worker thread"""
+        local_path = content['local_path']
+        display_mode = content.get('display_mode', 'fit')
+        size = (self.width(), self.height())
+        key = str(self.content_manager.scaled_path(local_path, display_mode, size))
+
+        def decode():
+            try:
+                image = self.content_manager.decode_image(local_path, display_mode, size)
+                if not image.isNull():
+                    self.signal_emitter.image_decoded.emit(key, image)
+            except Exception as e:
+                print(f"Error decoding image: {e}")
+
+        download_executor.submit(decode)
+
+    def on_image_decoded(self, key, image):
+        """Keep a decoded image until it is displayed (called from main thread)"""
+        self._decoded[key] = image
 
     def show_image(self, content):
         """Display an image"""
         self.video_widget.hide()
-        self.image_label.show()
-
-        pixmap = QPixmap(content['local_path'])
+        self.image_label.hide()
+        self.image_view.setGeometry(self.rect())
+        self.image_view.show()
 
-        # Determine aspect ratio mode based on display_mode setting
+        # Images are normally pre-scaled to the window size at download time;
+        # the view only has to fit them, which is (close to) a 1:1 draw
         display_mode = content.get('display_mode', 'fit')
-        if display_mode == 'fill':
-            # Scale to fill: crop content to fill screen (KeepAspectRatioByExpanding)
-            aspect_mode = Qt.KeepAspectRatioByExpanding
+        size = (self.width(), self.height())
+        scaled_path = self.content_manager.scaled_path(content['local_path'], display_mode, size)
+
+        image = self._decoded.pop(str(scaled_path), None)
+        if image is not None:
+            pixmap = QPixmap.fromImage(image)
+        elif scaled_path.exists():
+            pixmap = QPixmap(str(scaled_path))
         else:
-            # Scale to fit: show black bars, no cropping (KeepAspectRatio)
-            aspect_mode = Qt.KeepAspectRatio
+            pixmap = QPixmap(content['local_path'])
+            download_executor.submit(
+                self.content_manager.prescale_image, content['local_path'], display_mode, size
+            )
 
-        scaled_pixmap = pixmap.scaled(
-            self.size(),
-            aspect_mode,
-            Qt.SmoothTransformation
-        )
-        self.image_label.setPixmap(scaled_pixmap)
+        self.pixmap_item.setPixmap(pixmap)
+        self.image_scene.setSceneRect(self.pixmap_item.boundingRect())
+        self.image_aspect_mode = aspect_ratio_mode(display_mode)
+        self.image_view.fitInView(self.pixmap_item, self.image_aspect_mode)
 
         # Set timer for next content
         duration = content.get('duration', 10) * 1000  # Convert to milliseconds
@@ -341,6 +720,7 @@ class SignagePlayer(QMainWindow):
     def show_video(self, content):
         """Display a video"""
         self.image_label.hide()
+        self.image_view.hide()
         self.video_widget.show()
         self.video_widget.setGeometry(self.rect())
 
@@ -363,6 +743,7 @@ class SignagePlayer(QMainWindow):
         """Display a webpage (placeholder - would need QWebEngineView)"""
         # For now, show URL as text
         self.video_widget.hide()
+        self.image_view.hide()
         self.image_label.show()
         self.image_label.setText(f"Webpage:\n{content['file_path']}")
 
@@ -372,6 +753,7 @@ class SignagePlayer(QMainWindow):
     def show_no_content_message(self):
         """Show message when no content is assigned"""
         self.video_widget.hide()
+        self.image_view.hide()
         self.image_label.show()
         self.image_label.setText(
             f"Digital Signage Player\n\n"
@@ -387,6 +769,28 @@ class SignagePlayer(QMainWindow):
         # Check again in 30 seconds
         self.display_timer.start(30000)
 
+    def resizeEvent(self, event):
+        """Track the window size that images are pre-scaled to"""
+        super().resizeEvent(event)
+        self.content_manager.screen_size = (self.width(), self.height())
+        self.prescale_timer.start(500)
+
+        if self.image_view.isVisible():
+            self.image_view.setGeometry(self.rect())
+            self.image_view.fitInView(self.pixmap_item, self.image_aspect_mode)
+
+    def prescale_playlist(self):
+        """Pre-scale the current playlist's images for the current window size"""
+        size = self.content_manager.screen_size
+        for content in self.current_playlist:
+            if content['content_type'] == 'image':
+                download_executor.submit(
+                    self.content_manager.prescale_image,
+                    content['local_path'],
+                    content.get('display_mode', 'fit'),
+                    size
+                )
+
     def keyPressEvent(self, event):
         """Handle key presses"""
         if event.key() == Qt.Key_Escape or event.key() == Qt.Key_Q:
@@ -422,7 +826,9 @@ class FallbackPlayer:
                 # Get content
                 data = self.server_comm.get_content()
 
-                if data and data.get('items'):
+                if data is UNCHANGED:
+                    pass
+                elif data and data.get('items'):
                     print(f"\n=== Playlist: {len(data['items'])} items ===")
                     for item in data['items']:
                         content = item['content']
@@ -0,0 +1,24 @@
+"""
+Coarse UTC clock for hot request paths
+Reuses one datetime.utcnow() value for up to 100 ms instead of building a
+new datetime on every heartbeat
+"""
+import time
+from datetime import datetime
+
+# Seconds a cached timestamp is reused
+RESOLUTION = 0.1
+
+# (monotonic reading, utcnow at that moment); replaced as a whole so threads
+# never see a half-updated pair
+_cached = (float('-inf'), None)
+
+def fast_utcnow():
+    """datetime.utcnow() with 100 ms resolution"""
+    global _cached
+    now = time.monotonic()
+    checked_at, value = _cached
+    if now - checked_at >= RESOLUTION:
+        value = datetime.utcnow()
+        _cached = (now, value)
+    return value
@@ -2,6 +2,27 @@
 Database initialization module
 Separates database object to avoid circular imports
 """
+import os
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import scoped_session, sessionmaker
 
 db = SQLAlchemy()
+
+# Session for read-only endpoints: it never autoflushes and never expires what
+# it loaded, so reads skip the unit-of-work bookkeeping. Bound to db.engine and
+# removed at the end of every request by init_ro_session()
+ro_session = scoped_session(sessionmaker(autoflush=False, expire_on_commit=False))
+
+def init_ro_session(app):
+    with app.app_context():
+        ro_session.configure(bind=db.engine)
+
+    @app.teardown_appcontext
+    def remove_ro_session(exception=None):
+        ro_session.remove()
+
+# Optional Redis for shared caches; None when REDIS_URL is not set
+redis_client = None
+if os.getenv('REDIS_URL'):
+    import redis
+    redis_client = redis.Redis.from_url(os.getenv('REDIS_URL'))
@@ -0,0 +1,75 @@
+"""
+Change notification for screen event streams
+Admin changes bump a version counter that wakes any waiting streams. With
+Redis configured the change is published on a channel so streams in every
+worker process wake, not just those in the worker that handled the change.
+"""
+import threading
+import time
+
+from database import redis_client
+
+CHANNEL = 'events:content_changed'
+
+_condition = threading.Condition()
+_version = 0
+_listener = None
+_listener_lock = threading.Lock()
+
+def current_version():
+    """Return the current content version"""
+    _ensure_listener()
+    with _condition:
+        return _version
+
+def notify_content_changed():
+    """Wake event streams after playlists, content or assignments change"""
+    if redis_client is not None:
+        _ensure_listener()
+        try:
+            # This process's own listener picks the message up like every other worker's
+            redis_client.publish(CHANNEL, b'1')
+            return
+        except Exception as e:
+            print(f"Error publishing content change, waking local streams only: {e}")
+    _bump()
+
+def wakes_all_workers():
+    """Whether a change made in any worker process wakes this process's streams"""
+    return redis_client is not None
+
+def wait_for_change(version, timeout):
+    """Block until the content version moves past `version` or `timeout` expires"""
+    with _condition:
+        _condition.wait_for(lambda: _version != version, timeout)
+        return _version
+
+def _bump():
+    global _version
+    with _condition:
+        _version += 1
+        _condition.notify_all()
+
+def _ensure_listener():
+    """Start this process's Redis subscriber if needed"""
+    global _listener
+    if redis_client is None or (_listener is not None and _listener.is_alive()):
+        return
+
+    with _listener_lock:
+        if _listener is None or not _listener.is_alive():
+            _listener = threading.Thread(target=_listen, daemon=True)
+            _listener.start()
+
+def _listen():
+    while True:
+        try:
+            pubsub = redis_client.pubsub()
+            pubsub.subscribe(CHANNEL)
+            for message in pubsub.listen():
+                # Also bump on (re)subscribing: changes may have been missed while not subscribed
+                if message['type'] in ('message', 'subscribe'):
+                    _bump()
+        except Exception as e:
+            print(f"Content change subscription lost, retrying: {e}")
+            time.sleep(1)
@@ -0,0 +1,16 @@
+"""
+Gunicorn configuration
+gevent workers serve each request as a greenlet, so long-lived event
+streams and slow clients don't tie up a whole worker process
+"""
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', 4))
+worker_class = 'gevent'
+worker_connections = 1000
+
+def post_fork(server, worker):
+    # Let psycopg2 yield to other greenlets while waiting on PostgreSQL
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
@@ -0,0 +1,83 @@
+"""
+Write-behind buffer for screen heartbeats
+Heartbeats are kept in memory, latest per screen, and written as one bulk
+UPDATE every few seconds, instead of one commit per heartbeat. With Redis
+configured heartbeats go to the presence set instead (see presence.py) and
+only screens going offline are written here
+"""
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import update, bindparam
+
+from clock import fast_utcnow
+from database import db
+import presence
+from models import Screen
+
+# Seconds between flushes of queued heartbeats
+FLUSH_INTERVAL = 5
+
+# identifier -> time of the latest heartbeat not yet written
+_pending = {}
+_pending_lock = threading.Lock()
+_flusher = None
+_flusher_lock = threading.Lock()
+
+def record(identifier):
+    """Note a heartbeat from a screen"""
+    if not presence.mark_seen(identifier):
+        with _pending_lock:
+            _pending[identifier] = fast_utcnow()
+    _ensure_flusher(current_app._get_current_object())
+
+def flush():
+    """Write pending heartbeats and expired presence to the database (needs an app context)"""
+    global _pending
+    with _pending_lock:
+        latest, _pending = _pending, {}
+
+    expired = presence.expired()
+    if not latest and not expired:
+        return
+
+    screens = Screen.__table__
+    seen = update(screens).where(screens.c.identifier == bindparam('b_identifier'))
+    if latest:
+        db.session.execute(
+            seen.values(status='online', last_seen=bindparam('b_last_seen')),
+            [{'b_identifier': identifier, 'b_last_seen': seen_at}
+             for identifier, seen_at in latest.items()]
+        )
+    if expired:
+        db.session.execute(
+            seen.values(status='offline', last_seen=bindparam('b_last_seen')),
+            [{'b_identifier': identifier, 'b_last_seen': datetime.utcfromtimestamp(seen_at)}
+             for identifier, seen_at in expired]
+        )
+    db.session.commit()
+
+    # Only once offline is persisted; if the commit failed they stay online and are retried
+    presence.forget(expired)
+
+def _ensure_flusher(app):
+    """Start the background flush thread for this process if needed"""
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+
+    with _flusher_lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = threading.Thread(target=_flush_loop, args=(app,), daemon=True)
+            _flusher.start()
+
+def _flush_loop(app):
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        try:
+            with app.app_context():
+                flush()
+        except Exception as e:
+            print(f"Error flushing heartbeats: {e}")
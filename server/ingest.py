@@ -0,0 +1,155 @@
+"""
+Upload ingestion: deduplication, thumbnails and the content row
+Uploads are saved to the incoming folder by the request; the rest runs on an
+RQ worker when Redis is configured (rq worker uploads), otherwise inline
+"""
+import os
+import shutil
+
+import orjson
+from flask import current_app, has_app_context
+
+from database import db, redis_client
+from models import Content
+from thumbnails import generate_thumbnail
+
+# Seconds an upload's status stays queryable
+STATUS_TTL = 3600
+# Seconds a worker may spend on one upload
+JOB_TIMEOUT = 300
+
+upload_queue = None
+if redis_client is not None:
+    from rq import Queue
+    upload_queue = Queue('uploads', connection=redis_client)
+
+def incoming_path(filename):
+    """Where a raw upload is saved before processing"""
+    return os.path.join(current_app.config['INCOMING_FOLDER'], filename)
+
+def enqueue(upload_id, fields):
+    """Queue an upload for a worker; returns False if there is no queue to use"""
+    if upload_queue is None:
+        return False
+
+    try:
+        set_status(upload_id, {'status': 'pending'})
+        upload_queue.enqueue(run_upload_job, upload_id, fields,
+                             job_id=f'upload-{upload_id}', job_timeout=JOB_TIMEOUT)
+        return True
+    except Exception as e:
+        print(f"Error queueing upload {upload_id}, processing inline: {e}")
+        return False
+
+def set_status(upload_id, status):
+    redis_client.set(f'upload:{upload_id}', orjson.dumps(status), ex=STATUS_TTL)
+
+def get_status(upload_id):
+    """Status of a queued upload, or None if it is unknown"""
+    if redis_client is None:
+        return None
+    data = redis_client.get(f'upload:{upload_id}')
+    return orjson.loads(data) if data else None
+
+def run_upload_job(upload_id, fields):
+    """RQ job: process an upload and record the outcome for status polling
+
+    Any exception marks the upload as failed and removes the raw file before
+    it is re-raised, so RQ records the failure and pollers stop waiting.
+    """
+    try:
+        if has_app_context():
+            result, status_code = _process_or_discard(fields)
+        else:
+            from app import app
+            with app.app_context():
+                result, status_code = _process_or_discard(fields)
+    except Exception as e:
+        set_status(upload_id, {'status': 'error', 'error': f'Failed to create content: {str(e)}'})
+        raise
+
+    if status_code == 200:
+        set_status(upload_id, {'status': 'done', **result})
+    else:
+        set_status(upload_id, {'status': 'error', **result})
+
+def _process_or_discard(fields):
+    try:
+        return process_upload(fields)
+    except Exception:
+        db.session.rollback()
+        discard_incoming(fields)
+        raise
+
+def discard_incoming(fields):
+    """Remove an upload's raw file if it is still waiting in the incoming folder"""
+    path = incoming_path(fields['file_path'])
+    if os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError as e:
+            print(f"Error removing incoming upload {path}: {e}")
+
+def process_upload(fields):
+    """Turn a saved upload into a content row; returns (response body, HTTP status)"""
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    temp_path = incoming_path(fields['file_path'])
+    file_path = os.path.join(upload_folder, fields['file_path'])
+
+    # Identical bytes were uploaded before; reuse that content instead of storing a copy
+    existing = Content.query.filter_by(checksum=fields['checksum']).first()
+    if existing and os.path.exists(os.path.join(upload_folder, existing.file_path)):
+        os.remove(temp_path)
+        return {
+            'success': True,
+            'duplicate': True,
+            'content': existing.to_dict()
+        }, 200
+
+    try:
+        # A rename when both folders share a filesystem, a copy otherwise
+        shutil.move(temp_path, file_path)
+    except Exception as e:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return {'error': f'Failed to save file: {str(e)}'}, 500
+
+    thumbnail_path = None
+    try:
+        duration = int(fields['duration'])
+
+        thumbnail_path = generate_thumbnail(upload_folder, fields['file_path'], fields['content_type'])
+
+        # Create content entry
+        content = Content(
+            name=fields['name'],
+            content_type=fields['content_type'],
+            file_path=fields['file_path'],
+            duration=duration,
+            file_size=fields['file_size'],
+            mime_type=fields['mime_type'],
+            checksum=fields['checksum'],
+            thumbnail_path=thumbnail_path
+        )
+
+        db.session.add(content)
+        db.session.commit()
+
+        return {
+            'success': True,
+            'content': content.to_dict()
+        }, 200
+
+    except Exception as e:
+        # Rollback database and cleanup file on error
+        db.session.rollback()
+        cleanup = [file_path]
+        if thumbnail_path:
+            cleanup.append(os.path.join(upload_folder, thumbnail_path))
+        for path in cleanup:
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                except:
+                    pass
+        return {'error': f'Failed to create content: {str(e)}'}, 500
@@ -0,0 +1,34 @@
+"""
+Flask JSON provider backed by orjson
+Serializes API responses several times faster than the standard json module
+"""
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+# Bytes buffered before a streamed JSON chunk is sent
+STREAM_CHUNK_SIZE = 64 * 1024
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider that encodes with orjson, using Flask's fallbacks for other types"""
+
+    def dumps(self, obj, **kwargs):
+        # Naive datetimes are written as-is (no UTC offset), matching isoformat()
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+def stream_json_list(key, items):
+    """Encode {key: [items...]} incrementally, so a large listing is never held in memory at once"""
+    buffer = [b'{' + orjson.dumps(key) + b':[']
+    size = 0
+    for i, item in enumerate(items):
+        chunk = orjson.dumps(item, default=DefaultJSONProvider.default)
+        buffer.append(b',' + chunk if i else chunk)
+        size += len(chunk)
+        if size >= STREAM_CHUNK_SIZE:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    buffer.append(b']}')
+    yield b''.join(buffer)
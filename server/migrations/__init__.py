@@ -0,0 +1,47 @@
+"""
+Schema migrations for databases created before a column was added to the models
+
+Every module listed in MIGRATIONS exposes an idempotent migrate() function.
+Apply the pending ones with (from the server directory):
+    python -m migrations.run_all
+"""
+
+import re
+from sqlalchemy import inspect, text
+from database import db
+
+def table_exists(table):
+    """Check whether a table exists in the current app's database"""
+    return inspect(db.engine).has_table(table)
+
+def column_exists(table, column):
+    """Check whether a table already has the given column"""
+    if db.engine.dialect.name == 'sqlite':
+        # One row of DDL text instead of materializing every column via PRAGMA
+        ddl = db.session.execute(
+            text("SELECT sql FROM sqlite_master WHERE type='table' AND name=:table"),
+            {'table': table}
+        ).scalar()
+        return bool(ddl) and re.search(rf'\b{re.escape(column)}\b', ddl) is not None
+
+    return db.session.execute(
+        text("""
+            SELECT 1
+            FROM information_schema.columns
+            WHERE table_name=:table
+            AND column_name=:column
+        """),
+        {'table': table, 'column': column}
+    ).first() is not None
+
+# Module names under migrations/, applied in this order by run_all
+MIGRATIONS = [
+    'add_display_mode',
+    'add_duration_override',
+    'add_checksum',
+    'add_playlist_item_order_index',
+    'add_content_checksum_index',
+    'add_playlist_item_count',
+    'add_thumbnail_path',
+    'add_updated_at',
+]
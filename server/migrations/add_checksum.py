@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add the checksum column to the content table
+and fill it in for files that were uploaded before it existed
+Run with: python -m migrations.add_checksum (or migrations.run_all for every migration)
+"""
+
+import os
+from app import app, db
+from uploads import file_checksum
+from migrations import table_exists, column_exists
+from sqlalchemy import text
+
+def migrate():
+    with app.app_context():
+        try:
+            # Check if content table exists
+            if not table_exists('content'):
+                print("✓ Content table doesn't exist yet - no migration needed")
+                return
+
+            # Check if column already exists
+            if column_exists('content', 'checksum'):
+                print("✓ Column 'checksum' already exists in content table")
+            else:
+                # Add the checksum column
+                print("Adding checksum column to content table...")
+                db.session.execute(text("""
+                    ALTER TABLE content
+                    ADD COLUMN checksum VARCHAR(64)
+                """))
+                db.session.commit()
+                print("✓ Successfully added checksum column!")
+
+            # Backfill checksums for existing uploads; plain SQL on the columns
+            # needed, since the Content model may map columns added by later migrations
+            pending = db.session.execute(text("""
+                SELECT id, file_path
+                FROM content
+                WHERE checksum IS NULL
+                AND content_type != 'webpage'
+            """)).all()
+
+            for content_id, stored_path in pending:
+                file_path = os.path.join(app.config['UPLOAD_FOLDER'], stored_path or '')
+                if stored_path and os.path.exists(file_path):
+                    db.session.execute(
+                        text("UPDATE content SET checksum = :checksum WHERE id = :id"),
+                        {'checksum': file_checksum(file_path), 'id': content_id}
+                    )
+            db.session.commit()
+
+            print(f"✓ Checked {len(pending)} content file(s) for missing checksums")
+            print("✓ Migration complete!")
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"✗ Error during migration: {e}")
+            raise
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Database Migration: Add checksum to content")
+    print("=" * 60)
+    migrate()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Database migration script to index content by checksum, used to find duplicate uploads
+Run with: python -m migrations.add_content_checksum_index (or migrations.run_all for every migration)
+"""
+
+from app import app, db
+from migrations import table_exists
+from sqlalchemy import text
+
+def migrate():
+    with app.app_context():
+        try:
+            # Check if content table exists
+            if not table_exists('content'):
+                print("✓ Content table doesn't exist yet - no migration needed")
+                return
+
+            print("Creating ix_content_checksum index...")
+            db.session.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_content_checksum
+                ON content (checksum)
+            """))
+            db.session.commit()
+
+            print("✓ Migration complete!")
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"✗ Error during migration: {e}")
+            raise
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Database Migration: Index content by checksum")
+    print("=" * 60)
+    migrate()
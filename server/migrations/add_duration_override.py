@@ -1,25 +1,23 @@
 #!/usr/bin/env python3
 """
 Database migration script to add duration_override column to playlist_items table
-Run this script to update your database schema
+Run with: python -m migrations.add_duration_override (or migrations.run_all for every migration)
 """
 
-import os
 from app import app, db
+from migrations import table_exists, column_exists
 from sqlalchemy import text
 
 def migrate():
     with app.app_context():
         try:
-            # Check if column already exists
-            result = db.session.execute(text("""
-                SELECT column_name
-                FROM information_schema.columns
-                WHERE table_name='playlist_items'
-                AND column_name='duration_override'
-            """))
+            # Check if playlist_items table exists
+            if not table_exists('playlist_items'):
+                print("✓ playlist_items table doesn't exist yet - no migration needed")
+                return
 
-            if result.fetchone():
+            # Check if column already exists
+            if column_exists('playlist_items', 'duration_override'):
                 print("✓ Column 'duration_override' already exists in playlist_items table")
                 return
 
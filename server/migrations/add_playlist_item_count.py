@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add the item_count order counter to the playlists table
+and start it at each playlist's highest item order
+Run with: python -m migrations.add_playlist_item_count (or migrations.run_all for every migration)
+"""
+
+from app import app, db
+from migrations import table_exists, column_exists
+from sqlalchemy import text
+
+def migrate():
+    with app.app_context():
+        try:
+            # Check if playlists table exists
+            if not table_exists('playlists'):
+                print("✓ playlists table doesn't exist yet - no migration needed")
+                return
+
+            # Check if column already exists
+            if column_exists('playlists', 'item_count'):
+                print("✓ Column 'item_count' already exists in playlists table")
+                return
+
+            # Add the item_count column
+            print("Adding item_count column to playlists table...")
+            db.session.execute(text("""
+                ALTER TABLE playlists
+                ADD COLUMN item_count INTEGER NOT NULL DEFAULT 0
+            """))
+
+            # Continue numbering after the existing items
+            db.session.execute(text("""
+                UPDATE playlists
+                SET item_count = COALESCE(
+                    (SELECT MAX("order") FROM playlist_items WHERE playlist_id = playlists.id), 0
+                )
+            """))
+            db.session.commit()
+
+            print("✓ Successfully added item_count column!")
+            print("✓ Migration complete!")
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"✗ Error during migration: {e}")
+            raise
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Database Migration: Add item_count to playlists")
+    print("=" * 60)
+    migrate()
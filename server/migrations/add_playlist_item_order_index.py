@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Database migration script to index playlist_items by (playlist_id, order)
+Run with: python -m migrations.add_playlist_item_order_index (or migrations.run_all for every migration)
+"""
+
+from app import app, db
+from migrations import table_exists
+from sqlalchemy import text
+
+def migrate():
+    with app.app_context():
+        try:
+            # Check if playlist_items table exists
+            if not table_exists('playlist_items'):
+                print("✓ playlist_items table doesn't exist yet - no migration needed")
+                return
+
+            print("Creating ix_playlistitem_playlist_order index...")
+            db.session.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_playlistitem_playlist_order
+                ON playlist_items (playlist_id, "order")
+            """))
+            db.session.commit()
+
+            print("✓ Migration complete!")
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"✗ Error during migration: {e}")
+            raise
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Database Migration: Index playlist_items by playlist and order")
+    print("=" * 60)
+    migrate()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add the thumbnail_path column to the content table
+and generate thumbnails for files that were uploaded before it existed
+Run with: python -m migrations.add_thumbnail_path (or migrations.run_all for every migration)
+"""
+
+import os
+from app import app, db
+from thumbnails import generate_thumbnail
+from migrations import table_exists, column_exists
+from sqlalchemy import text
+
+def migrate():
+    with app.app_context():
+        try:
+            # Check if content table exists
+            if not table_exists('content'):
+                print("✓ Content table doesn't exist yet - no migration needed")
+                return
+
+            # Check if column already exists
+            if column_exists('content', 'thumbnail_path'):
+                print("✓ Column 'thumbnail_path' already exists in content table")
+            else:
+                # Add the thumbnail_path column
+                print("Adding thumbnail_path column to content table...")
+                db.session.execute(text("""
+                    ALTER TABLE content
+                    ADD COLUMN thumbnail_path VARCHAR(500)
+                """))
+                db.session.commit()
+                print("✓ Successfully added thumbnail_path column!")
+
+            # Generate thumbnails for existing uploads; plain SQL on the columns
+            # needed, since the Content model may map columns added by later migrations
+            pending = db.session.execute(text("""
+                SELECT id, file_path, content_type
+                FROM content
+                WHERE thumbnail_path IS NULL
+                AND content_type != 'webpage'
+            """)).all()
+
+            upload_folder = app.config['UPLOAD_FOLDER']
+            for content_id, file_path, content_type in pending:
+                if not file_path or not os.path.exists(os.path.join(upload_folder, file_path)):
+                    continue
+                thumbnail_path = generate_thumbnail(upload_folder, file_path, content_type)
+                if thumbnail_path:
+                    db.session.execute(
+                        text("UPDATE content SET thumbnail_path = :thumbnail_path WHERE id = :id"),
+                        {'thumbnail_path': thumbnail_path, 'id': content_id}
+                    )
+            db.session.commit()
+
+            print(f"✓ Checked {len(pending)} content file(s) for missing thumbnails")
+            print("✓ Migration complete!")
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"✗ Error during migration: {e}")
+            raise
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Database Migration: Add thumbnail_path to content")
+    print("=" * 60)
+    migrate()
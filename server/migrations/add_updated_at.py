@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Database migration script to add updated_at columns to the content and screens tables
+Existing rows start with their created_at time
+Run with: python -m migrations.add_updated_at (or migrations.run_all for every migration)
+"""
+
+from app import app, db
+from migrations import table_exists, column_exists
+from sqlalchemy import text
+
+TABLES = ['content', 'screens']
+
+def migrate():
+    with app.app_context():
+        try:
+            for table in TABLES:
+                # Check if table exists
+                if not table_exists(table):
+                    print(f"✓ {table} table doesn't exist yet - no migration needed")
+                    continue
+
+                # Check if column already exists
+                if column_exists(table, 'updated_at'):
+                    print(f"✓ Column 'updated_at' already exists in {table} table")
+                    continue
+
+                # Add the updated_at column
+                print(f"Adding updated_at column to {table} table...")
+                db.session.execute(text(f"""
+                    ALTER TABLE {table}
+                    ADD COLUMN updated_at TIMESTAMP
+                """))
+                db.session.execute(text(f"""
+                    UPDATE {table}
+                    SET updated_at = created_at
+                """))
+                db.session.commit()
+                print(f"✓ Successfully added updated_at column to {table}!")
+
+            print("✓ Migration complete!")
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"✗ Error during migration: {e}")
+            raise
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Database Migration: Add updated_at to content and screens")
+    print("=" * 60)
+    migrate()
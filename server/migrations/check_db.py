@@ -17,11 +17,11 @@ if db_path.exists():
 
     # List all tables
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    tables = cursor.fetchall()
-    print(f"\nTables in database: {[t[0] for t in tables]}")
+    tables = {row[0] for row in cursor}
+    print(f"\nTables in database: {sorted(tables)}")
 
     # Check content table structure
-    if any(t[0] == 'content' for t in tables):
+    if 'content' in tables:
         cursor.execute("PRAGMA table_info(content)")
         columns = cursor.fetchall()
         print("\nContent table columns:")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Apply every registered migration that has not been applied yet
+
+Applied migrations are recorded in the schema_migrations table, so a
+deploy can run this on every boot and only pay for one lookup per migration.
+Run from the server directory: python -m migrations.run_all
+"""
+
+import importlib
+from datetime import datetime
+from app import app, db
+from migrations import MIGRATIONS
+from sqlalchemy import text
+
+def run_all():
+    with app.app_context():
+        db.session.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                name VARCHAR(100) PRIMARY KEY,
+                applied_at TIMESTAMP
+            )
+        """))
+        db.session.commit()
+
+        for name in MIGRATIONS:
+            applied = db.session.execute(
+                text("SELECT 1 FROM schema_migrations WHERE name = :name"),
+                {'name': name}
+            ).first()
+            if applied:
+                print(f"✓ {name} already applied")
+                continue
+
+            print(f"Running migration: {name}")
+            importlib.import_module(f'migrations.{name}').migrate()
+
+            db.session.execute(
+                text("INSERT INTO schema_migrations (name, applied_at) VALUES (:name, :applied_at)"),
+                {'name': name, 'applied_at': datetime.utcnow()}
+            )
+            db.session.commit()
+
+        print("✓ All migrations applied")
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Database Migrations")
+    print("=" * 60)
+    run_all()
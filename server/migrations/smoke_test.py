@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Smoke test for run_all against a database with the original schema
+
+Builds a throwaway SQLite database with the tables as they were before any
+migration existed, runs every migration on it (twice, to check they are
+idempotent) and checks the models can load the result.
+Run from the server directory: python -m migrations.smoke_test
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+
+# Tables as created by the first release, before any column was migrated in
+BASELINE_SCHEMA = """
+CREATE TABLE users (
+    id INTEGER NOT NULL,
+    username VARCHAR(80) NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    email VARCHAR(120) NOT NULL,
+    created_at DATETIME,
+    PRIMARY KEY (id),
+    UNIQUE (username),
+    UNIQUE (email)
+);
+CREATE TABLE content (
+    id INTEGER NOT NULL,
+    name VARCHAR(200) NOT NULL,
+    content_type VARCHAR(20) NOT NULL,
+    file_path VARCHAR(500),
+    duration INTEGER,
+    file_size INTEGER,
+    mime_type VARCHAR(100),
+    created_at DATETIME,
+    PRIMARY KEY (id)
+);
+CREATE TABLE playlists (
+    id INTEGER NOT NULL,
+    name VARCHAR(200) NOT NULL,
+    description TEXT,
+    transition_effect VARCHAR(50),
+    created_at DATETIME,
+    updated_at DATETIME,
+    PRIMARY KEY (id)
+);
+CREATE TABLE screens (
+    id INTEGER NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    identifier VARCHAR(100) NOT NULL,
+    location VARCHAR(200),
+    status VARCHAR(20),
+    last_seen DATETIME,
+    current_playlist_id INTEGER,
+    created_at DATETIME,
+    PRIMARY KEY (id),
+    UNIQUE (identifier),
+    FOREIGN KEY(current_playlist_id) REFERENCES playlists (id)
+);
+CREATE TABLE playlist_items (
+    id INTEGER NOT NULL,
+    playlist_id INTEGER NOT NULL,
+    content_id INTEGER NOT NULL,
+    "order" INTEGER NOT NULL,
+    schedule_start TIME,
+    schedule_end TIME,
+    PRIMARY KEY (id),
+    FOREIGN KEY(playlist_id) REFERENCES playlists (id),
+    FOREIGN KEY(content_id) REFERENCES content (id)
+);
+INSERT INTO content (id, name, content_type, file_path, duration, created_at)
+VALUES (1, 'Lobby', 'image', 'missing.png', 10, '2024-01-01 00:00:00');
+INSERT INTO playlists (id, name, created_at, updated_at)
+VALUES (1, 'Default', '2024-01-01 00:00:00', '2024-01-01 00:00:00');
+INSERT INTO playlist_items (id, playlist_id, content_id, "order")
+VALUES (1, 1, 1, 1);
+INSERT INTO screens (id, name, identifier, status, current_playlist_id, created_at)
+VALUES (1, 'Display 1', 'smoke-test', 'offline', 1, '2024-01-01 00:00:00');
+"""
+
+def main():
+    workdir = tempfile.mkdtemp(prefix='signage-migrations-')
+    db_path = os.path.join(workdir, 'baseline.db')
+    conn = sqlite3.connect(db_path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.close()
+
+    # The app reads DATABASE_URL when it is first imported
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    from app import app, db
+    from migrations import column_exists
+    from migrations.run_all import run_all
+    from models import User, Screen, Content, Playlist, PlaylistItem
+
+    run_all()
+    run_all()
+
+    failures = []
+    with app.app_context():
+        for model in (User, Screen, Content, Playlist, PlaylistItem):
+            table = model.__tablename__
+            for column in model.__table__.columns:
+                if not column_exists(table, column.name):
+                    failures.append(f"{table}.{column.name} was not migrated")
+
+        if not failures:
+            for model in (User, Screen, Content, Playlist, PlaylistItem):
+                model.query.all()
+            playlist = db.session.get(Playlist, 1)
+            if [item['content']['name'] for item in playlist.to_dict()['items']] != ['Lobby']:
+                failures.append("playlist 1 lost its item")
+
+    for failure in failures:
+        print(f"✗ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✓ Baseline database migrated cleanly")
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("Migration smoke test")
+    print("=" * 60)
+    main()
@@ -10,13 +10,12 @@ class User(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'username': self.username,
-            'email': self.email,
-            'created_at': self.created_at.isoformat()
-        }
+    __to_dict_fields__ = (
+        ('id', None),
+        ('username', None),
+        ('email', None),
+        ('created_at', None),
+    )
 
 class Screen(db.Model):
     __tablename__ = 'screens'
@@ -29,20 +28,20 @@ class Screen(db.Model):
     last_seen = db.Column(db.DateTime, default=datetime.utcnow)
     current_playlist_id = db.Column(db.Integer, db.ForeignKey('playlists.id'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     current_playlist = db.relationship('Playlist', foreign_keys=[current_playlist_id])
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'identifier': self.identifier,
-            'location': self.location,
-            'status': self.status,
-            'last_seen': self.last_seen.isoformat() if self.last_seen else None,
-            'current_playlist_id': self.current_playlist_id,
-            'created_at': self.created_at.isoformat()
-        }
+    __to_dict_fields__ = (
+        ('id', None),
+        ('name', None),
+        ('identifier', None),
+        ('location', None),
+        ('status', None),
+        ('last_seen', None),
+        ('current_playlist_id', None),
+        ('created_at', None),
+    )
 
 class Content(db.Model):
     __tablename__ = 'content'
@@ -55,20 +54,24 @@ class Content(db.Model):
     file_size = db.Column(db.Integer)  # Size in bytes
     mime_type = db.Column(db.String(100))
     display_mode = db.Column(db.String(20), default='fit')  # 'fit' (letterbox) or 'fill' (crop)
+    checksum = db.Column(db.String(64), index=True)  # SHA-256 of the file, lets players validate their cache
+    thumbnail_path = db.Column(db.String(500))  # WebP preview, relative to the upload folder
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'content_type': self.content_type,
-            'file_path': self.file_path,
-            'duration': self.duration,
-            'file_size': self.file_size,
-            'mime_type': self.mime_type,
-            'display_mode': self.display_mode,
-            'created_at': self.created_at.isoformat()
-        }
+    __to_dict_fields__ = (
+        ('id', None),
+        ('name', None),
+        ('content_type', None),
+        ('file_path', None),
+        ('duration', None),
+        ('file_size', None),
+        ('mime_type', None),
+        ('display_mode', None),
+        ('checksum', None),
+        ('thumbnail_path', None),
+        ('created_at', None),
+    )
 
 class Playlist(db.Model):
     __tablename__ = 'playlists'
@@ -77,24 +80,33 @@ class Playlist(db.Model):
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
     transition_effect = db.Column(db.String(50), default='fade')  # fade, slide, none
+    item_count = db.Column(db.Integer, default=0, nullable=False)  # Highest item order handed out
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     items = db.relationship('PlaylistItem', backref='playlist', lazy=True, order_by='PlaylistItem.order')
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'transition_effect': self.transition_effect,
-            'items': [item.to_dict() for item in self.items],
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
+    __to_dict_fields__ = (
+        ('id', None),
+        ('name', None),
+        ('description', None),
+        ('transition_effect', None),
+        ('created_at', None),
+        ('updated_at', None),
+    )
+
+    def to_dict(self, include_items=True):
+        data = self._fields_to_dict()
+        if include_items:
+            data['items'] = [item.to_dict() for item in self.items]
+        return data
 
 class PlaylistItem(db.Model):
     __tablename__ = 'playlist_items'
+    __table_args__ = (
+        # Items are always fetched per playlist in play order
+        db.Index('ix_playlistitem_playlist_order', 'playlist_id', 'order'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     playlist_id = db.Column(db.Integer, db.ForeignKey('playlists.id'), nullable=False)
@@ -106,18 +118,50 @@ class PlaylistItem(db.Model):
 
     content = db.relationship('Content')
 
-    def to_dict(self):
-        # Use duration_override if set, otherwise use content's default duration
-        duration = self.duration_override if self.duration_override is not None else self.content.duration
-
-        return {
-            'id': self.id,
-            'playlist_id': self.playlist_id,
-            'content_id': self.content_id,
-            'content': self.content.to_dict(),
-            'order': self.order,
-            'duration': duration,
-            'duration_override': self.duration_override,
-            'schedule_start': self.schedule_start.isoformat() if self.schedule_start else None,
-            'schedule_end': self.schedule_end.isoformat() if self.schedule_end else None
-        }
+    __to_dict_fields__ = (
+        ('id', None),
+        ('playlist_id', None),
+        ('content_id', None),
+        ('content', 'dict'),
+        ('order', None),
+        ('duration', None),
+        ('duration_override', None),
+        ('schedule_start', None),
+        ('schedule_end', None),
+    )
+
+    @property
+    def duration(self):
+        """Display duration: duration_override if set, otherwise the content's default"""
+        return self.duration_override if self.duration_override is not None else self.content.duration
+
+def _compile_to_dict(fields):
+    """Generate a to_dict function from a model's __to_dict_fields__ spec
+
+    Each field is (name, kind): None copies the attribute and 'dict' nests the
+    related object's to_dict(). Dates and times are left as objects; the
+    orjson JSON provider writes them in isoformat without a Python call each.
+    The dict literal is compiled once, so serializing skips any per-field loop.
+    """
+    entries = []
+    for name, kind in fields:
+        if kind is None:
+            value = f'self.{name}'
+        elif kind == 'dict':
+            value = f'self.{name}.to_dict()'
+        else:
+            raise ValueError(f"Unknown to_dict field kind for {name}: {kind}")
+        entries.append(f'{name!r}: {value}')
+
+    source = 'def to_dict(self):\n    return {' + ', '.join(entries) + '}\n'
+    namespace = {}
+    exec(source, namespace)
+    return namespace['to_dict']
+
+# Cython builds of these functions were measured and were no faster: the time
+# goes to SQLAlchemy's instrumented attribute access, not to building the dict
+for _model in (User, Screen, Content, PlaylistItem):
+    _model.to_dict = _compile_to_dict(_model.__to_dict_fields__)
+
+# Playlist.to_dict adds the optional items list around the generated fields
+Playlist._fields_to_dict = _compile_to_dict(Playlist.__to_dict_fields__)
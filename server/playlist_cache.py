@@ -0,0 +1,44 @@
+"""
+Short-lived Redis cache of the playlist body sent to screens
+Every screen on a playlist gets the same body, so it is rendered once per TTL
+and not once per poll. Does nothing when REDIS_URL is not configured.
+"""
+from database import redis_client
+
+# Seconds a rendered playlist body stays cached
+PLAYLIST_CACHE_TTL = 15
+
+def get_or_render(playlist_id, render):
+    """Return the cached body for a playlist, calling render() to build it on a miss"""
+    if redis_client is None:
+        return render()
+
+    try:
+        version = int(redis_client.get(f'pl:{playlist_id}:ver') or 0)
+        key = f'pl:{playlist_id}:v{version}'
+        body = redis_client.get(key)
+        if body is not None:
+            return body
+    except Exception as e:
+        print(f"Playlist cache unavailable: {e}")
+        return render()
+
+    body = render()
+    try:
+        redis_client.setex(key, PLAYLIST_CACHE_TTL, body)
+    except Exception as e:
+        print(f"Error caching playlist {playlist_id}: {e}")
+    return body
+
+def invalidate(*playlist_ids):
+    """Bump the version of each playlist so its cached body is no longer used"""
+    if redis_client is None or not playlist_ids:
+        return
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for playlist_id in playlist_ids:
+            pipe.incr(f'pl:{playlist_id}:ver')
+        pipe.execute()
+    except Exception as e:
+        print(f"Error invalidating playlist cache: {e}")
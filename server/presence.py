@@ -0,0 +1,93 @@
+"""
+Screen presence in a Redis sorted set
+Heartbeats score a screen's identifier with the time it was seen, so status
+and last_seen are read from Redis instead of being written to the database on
+every heartbeat. Screens that stop beating are written back once, as offline.
+Does nothing when REDIS_URL is not configured; heartbeats then go to the database.
+"""
+import time
+from datetime import datetime
+
+from database import redis_client
+
+PRESENCE_KEY = 'screens:online'
+# Seconds since the last heartbeat for a screen to count as online
+ONLINE_WINDOW = 60
+
+def mark_seen(identifier):
+    """Record a heartbeat; returns False if presence is not tracked in Redis"""
+    if redis_client is None:
+        return False
+
+    try:
+        redis_client.zadd(PRESENCE_KEY, {identifier: time.time()})
+        return True
+    except Exception as e:
+        print(f"Presence unavailable, heartbeat goes to the database: {e}")
+        return False
+
+def snapshot():
+    """identifier -> time of its latest heartbeat, for every screen in the set"""
+    if redis_client is None:
+        return {}
+
+    try:
+        return {identifier.decode(): seen_at
+                for identifier, seen_at in redis_client.zrange(PRESENCE_KEY, 0, -1, withscores=True)}
+    except Exception as e:
+        print(f"Error reading presence: {e}")
+        return {}
+
+def annotate(screens, seen=None):
+    """Yield screen dicts with status and last_seen filled in from the presence set"""
+    if seen is None:
+        seen = snapshot()
+
+    online_since = time.time() - ONLINE_WINDOW
+    for screen in screens:
+        seen_at = seen.get(screen['identifier'])
+        if seen_at is not None:
+            screen['status'] = 'online' if seen_at >= online_since else 'offline'
+            screen['last_seen'] = datetime.utcfromtimestamp(seen_at)
+        yield screen
+
+def expired():
+    """Screens that went quiet, as [(identifier, score)]; pass to forget() once persisted"""
+    if redis_client is None:
+        return []
+
+    try:
+        members = redis_client.zrangebyscore(PRESENCE_KEY, '-inf', time.time() - ONLINE_WINDOW, withscores=True)
+    except Exception as e:
+        print(f"Error reading expired presence: {e}")
+        return []
+    return [(identifier.decode(), seen_at) for identifier, seen_at in members]
+
+def forget(members):
+    """Remove expired screens from the set, skipping any that beat again since expired()"""
+    if redis_client is None or not members:
+        return
+
+    args = []
+    for identifier, seen_at in members:
+        args += [identifier, repr(seen_at)]
+    try:
+        _forget_unchanged(keys=[PRESENCE_KEY], args=args)
+    except Exception as e:
+        print(f"Error trimming presence: {e}")
+
+# ZREM each member only while its score is still the one that was read, so a
+# heartbeat arriving after expired() keeps the screen in the set
+FORGET_UNCHANGED_SCRIPT = """
+local removed = 0
+for i = 1, #ARGV, 2 do
+    local score = redis.call('ZSCORE', KEYS[1], ARGV[i])
+    if score and tonumber(score) == tonumber(ARGV[i + 1]) then
+        removed = removed + redis.call('ZREM', KEYS[1], ARGV[i])
+    end
+end
+return removed
+"""
+_forget_unchanged = None
+if redis_client is not None:
+    _forget_unchanged = redis_client.register_script(FORGET_UNCHANGED_SCRIPT)
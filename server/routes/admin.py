@@ -1,8 +1,12 @@
 from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for
 from werkzeug.security import check_password_hash, generate_password_hash
 from functools import wraps
+from sqlalchemy import update, case
 
 from database import db
+import events
+import playlist_cache
+import presence
 from models import User, Screen, Content, Playlist, PlaylistItem
 
 bp = Blueprint('admin', __name__, url_prefix='/admin')
@@ -15,6 +19,11 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def playlists_containing(content_id):
+    """IDs of the playlists that include a piece of content"""
+    rows = db.session.query(PlaylistItem.playlist_id).filter_by(content_id=content_id).distinct()
+    return [playlist_id for playlist_id, in rows]
+
 @bp.route('/login', methods=['GET', 'POST'])
 def login():
     if request.method == 'POST':
@@ -46,7 +55,7 @@ def logout():
 @bp.route('/dashboard')
 @login_required
 def dashboard():
-    screens = Screen.query.all()
+    screens = list(presence.annotate(screen.to_dict() for screen in Screen.query.all()))
     content_count = Content.query.count()
     playlist_count = Playlist.query.count()
 
@@ -81,6 +90,8 @@ def edit_content(content_id):
         content.display_mode = display_mode
 
     db.session.commit()
+    playlist_cache.invalidate(*playlists_containing(content_id))
+    events.notify_content_changed()
     return jsonify({'success': True})
 
 @bp.route('/content/<int:content_id>/delete', methods=['POST'])
@@ -88,17 +99,22 @@ def edit_content(content_id):
 def delete_content(content_id):
     content = Content.query.get(content_id)
     if content:
+        playlist_ids = playlists_containing(content_id)
         # Remove from playlists
         PlaylistItem.query.filter_by(content_id=content_id).delete()
         db.session.delete(content)
         db.session.commit()
+        playlist_cache.invalidate(*playlist_ids)
+        events.notify_content_changed()
         return jsonify({'success': True})
     return jsonify({'error': 'Content not found'}), 404
 
 @bp.route('/screens')
 @login_required
 def screens_page():
-    screens = Screen.query.order_by(Screen.created_at.desc()).all()
+    screens = list(presence.annotate(
+        screen.to_dict() for screen in Screen.query.order_by(Screen.created_at.desc()).all()
+    ))
     playlists = Playlist.query.all()
     return render_template('screens.html', screens=screens, playlists=playlists)
 
@@ -114,6 +130,7 @@ def assign_playlist(screen_id):
 
     screen.current_playlist_id = playlist_id
     db.session.commit()
+    events.notify_content_changed()
 
     return jsonify({'success': True})
 
@@ -160,10 +177,20 @@ def add_content_to_playlist(playlist_id):
     if not content:
         return jsonify({'error': 'Content not found'}), 404
 
-    # Use provided order or get next order number
+    # Take the next order number from the playlist's counter in one atomic
+    # UPDATE; an explicit order only moves the counter forward
+    if order is None:
+        item_count = Playlist.item_count + 1
+    else:
+        item_count = case((Playlist.item_count < order, order), else_=Playlist.item_count)
+    counter = db.session.execute(
+        update(Playlist)
+        .where(Playlist.id == playlist_id)
+        .values(item_count=item_count)
+        .returning(Playlist.item_count)
+    ).scalar()
     if order is None:
-        max_order = db.session.query(db.func.max(PlaylistItem.order)).filter_by(playlist_id=playlist_id).scalar() or 0
-        order = max_order + 1
+        order = counter
 
     item = PlaylistItem(
         playlist_id=playlist_id,
@@ -174,6 +201,8 @@ def add_content_to_playlist(playlist_id):
 
     db.session.add(item)
     db.session.commit()
+    playlist_cache.invalidate(playlist_id)
+    events.notify_content_changed()
 
     return jsonify({'success': True, 'item': item.to_dict()})
 
@@ -185,6 +214,8 @@ def delete_playlist_item(playlist_id, item_id):
     if item:
         db.session.delete(item)
         db.session.commit()
+        playlist_cache.invalidate(playlist_id)
+        events.notify_content_changed()
         return jsonify({'success': True})
     return jsonify({'error': 'Playlist item not found'}), 404
 
@@ -199,5 +230,7 @@ def delete_playlist(playlist_id):
         Screen.query.filter_by(current_playlist_id=playlist_id).update({'current_playlist_id': None})
         db.session.delete(playlist)
         db.session.commit()
+        playlist_cache.invalidate(playlist_id)
+        events.notify_content_changed()
         return jsonify({'success': True})
     return jsonify({'error': 'Playlist not found'}), 404
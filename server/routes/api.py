@@ -1,18 +1,136 @@
-from flask import Blueprint, request, jsonify, send_file, current_app
+from flask import Blueprint, request, jsonify, send_file, current_app, Response, stream_with_context
 from werkzeug.utils import secure_filename
-from datetime import datetime
+from sqlalchemy import select, func, bindparam
+from cachetools import LRUCache
+import hashlib
+import mimetypes
 import os
+import threading
 import uuid
 
-from database import db
+from database import db, ro_session
+import events
+import heartbeats
+import ingest
+import playlist_cache
+import presence
 from models import Screen, Content, Playlist, PlaylistItem
+from uploads import save_with_checksum
+from json_provider import stream_json_list
+from clock import fast_utcnow
 
 bp = Blueprint('api', __name__, url_prefix='/api')
 
-ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'bmp', 'mp4', 'avi', 'mov', 'webm', 'mkv'}
-
-def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+IMAGE_EXTS = {'png', 'jpg', 'jpeg', 'gif', 'bmp'}
+VIDEO_EXTS = {'mp4', 'avi', 'mov', 'webm', 'mkv'}
+# Allowed upload extension -> content type
+EXT_TO_TYPE = {**{ext: 'image' for ext in IMAGE_EXTS}, **{ext: 'video' for ext in VIDEO_EXTS}}
+
+# Rows fetched from the database per batch when streaming listings
+LIST_BATCH_SIZE = 100
+
+# Seconds between keep-alive comments (and DB re-checks) on event streams
+EVENT_KEEPALIVE_INTERVAL = 30
+
+# Seconds browsers may cache content thumbnails
+THUMBNAIL_MAX_AGE = 86400
+
+# Screen identifier -> primary key, so warm lookups skip the identifier query
+IDENTIFIER_CACHE = LRUCache(maxsize=4096)
+_identifier_cache_lock = threading.Lock()
+
+def upload_content_type(filename):
+    """Content type for an upload by extension, or None if the file type isn't allowed"""
+    if '.' not in filename:
+        return None
+    return EXT_TO_TYPE.get(filename.rsplit('.', 1)[1].lower())
+
+def send_upload(filename, max_age=None, **kwargs):
+    """Send a file from the upload folder, letting the front-end web server transfer it when configured"""
+    prefix = current_app.config.get('X_ACCEL_REDIRECT_PREFIX')
+    if prefix:
+        # nginx serves the file (with Range support) from its internal location
+        mimetype = kwargs.get('mimetype') or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response = current_app.response_class(mimetype=mimetype)
+        response.headers['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + filename
+        if kwargs.get('as_attachment'):
+            response.headers.set('Content-Disposition', 'attachment', filename=os.path.basename(filename))
+        if max_age is not None:
+            response.cache_control.public = True
+            response.cache_control.max_age = max_age
+        return response
+
+    # send_file adds X-Sendfile itself when USE_X_SENDFILE is on
+    file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+    return send_file(file_path, conditional=True, max_age=max_age, **kwargs)
+
+def state_etag(*parts):
+    """ETag fingerprinting the state a listing was built from"""
+    return hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest()
+
+def not_modified(etag):
+    """A 304 response if the client already has this ETag, else None"""
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    return None
+
+def with_etag(response, etag):
+    """Attach an ETag and make browsers revalidate it on every use"""
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+def list_rows(model, order_by):
+    """Serialize a whole table for a listing from plain row tuples
+
+    Selects just the model's to_dict columns and skips building ORM objects,
+    which only live long enough to be serialized once.
+    """
+    names = [name for name, kind in model.__to_dict_fields__]
+    stmt = (
+        select(*(getattr(model, name) for name in names))
+        .order_by(order_by)
+        .execution_options(yield_per=LIST_BATCH_SIZE)
+    )
+    for row in ro_session.execute(stmt):
+        yield dict(zip(names, row))
+
+# Built once so every identifier lookup reuses one statement and its compiled SQL
+SCREEN_ID_BY_IDENTIFIER = select(Screen.id).where(Screen.identifier == bindparam('identifier'))
+
+def get_screen_id(identifier, session=ro_session):
+    """Primary key of the screen with this identifier, or None"""
+    with _identifier_cache_lock:
+        screen_id = IDENTIFIER_CACHE.get(identifier)
+    if screen_id is not None:
+        return screen_id
+
+    screen_id = session.scalar(SCREEN_ID_BY_IDENTIFIER, {'identifier': identifier})
+    if screen_id is not None:
+        with _identifier_cache_lock:
+            IDENTIFIER_CACHE[identifier] = screen_id
+    return screen_id
+
+def get_screen_by_identifier(identifier, session=ro_session):
+    """Load a screen by identifier through a primary-key lookup
+
+    Read-only callers share ro_session with the rest of their request; pass
+    db.session to get a screen that will be modified and committed.
+    """
+    screen_id = get_screen_id(identifier, session)
+    if screen_id is None:
+        return None
+
+    screen = session.get(Screen, screen_id)
+    if screen is None or screen.identifier != identifier:
+        # The cached id is stale (screen removed); look it up again
+        with _identifier_cache_lock:
+            IDENTIFIER_CACHE.pop(identifier, None)
+        screen_id = get_screen_id(identifier, session)
+        screen = session.get(Screen, screen_id) if screen_id is not None else None
+    return screen
 
 @bp.route('/screen/register', methods=['POST'])
 def register_screen():
@@ -25,12 +143,12 @@ def register_screen():
     if not identifier:
         return jsonify({'error': 'Identifier required'}), 400
 
-    screen = Screen.query.filter_by(identifier=identifier).first()
+    screen = get_screen_by_identifier(identifier, db.session)
 
     if screen:
         # Update existing screen
         screen.status = 'online'
-        screen.last_seen = datetime.utcnow()
+        screen.last_seen = fast_utcnow()
         if name:
             screen.name = name
         if location:
@@ -42,11 +160,12 @@ def register_screen():
             name=name,
             location=location,
             status='online',
-            last_seen=datetime.utcnow()
+            last_seen=fast_utcnow()
         )
         db.session.add(screen)
 
     db.session.commit()
+    presence.mark_seen(identifier)
 
     return jsonify({
         'success': True,
@@ -56,47 +175,120 @@ def register_screen():
 @bp.route('/screen/<identifier>/heartbeat', methods=['POST'])
 def screen_heartbeat(identifier):
     """Update screen last seen timestamp"""
-    screen = Screen.query.filter_by(identifier=identifier).first()
-
-    if not screen:
+    if get_screen_id(identifier) is None:
         return jsonify({'error': 'Screen not found'}), 404
 
-    screen.status = 'online'
-    screen.last_seen = datetime.utcnow()
-    db.session.commit()
-
-    return jsonify({'success': True})
+    # Written to the database in batches by the heartbeat flusher
+    heartbeats.record(identifier)
+    return '', 204
 
 @bp.route('/screen/<identifier>/content', methods=['GET'])
 def get_screen_content(identifier):
     """Get content assigned to a screen"""
-    screen = Screen.query.filter_by(identifier=identifier).first()
+    screen = get_screen_by_identifier(identifier)
 
     if not screen:
         return jsonify({'error': 'Screen not found'}), 404
 
-    # Update last seen
-    screen.last_seen = datetime.utcnow()
-    screen.status = 'online'
-    db.session.commit()
+    # Polling for content counts as a heartbeat
+    heartbeats.record(identifier)
 
+    # Players send back the ETag so an unchanged playlist costs a 304
+    response = Response(screen_content_body(screen), mimetype='application/json')
+    response.add_etag()
+    return response.make_conditional(request)
+
+def screen_content_body(screen):
+    """Encoded playlist payload for a screen, shared through the playlist cache"""
+    render = lambda: current_app.json.dumps(screen_content_payload(screen)).encode()
     if not screen.current_playlist_id:
-        return jsonify({
+        return render()
+    return playlist_cache.get_or_render(screen.current_playlist_id, render)
+
+def screen_content_payload(screen):
+    """Build the playlist payload sent to a screen"""
+    if not screen.current_playlist_id:
+        return {
             'playlist': None,
             'items': []
-        })
-
-    playlist = Playlist.query.get(screen.current_playlist_id)
-
-    if not playlist:
-        return jsonify({
+        }
+
+    # The playlist, its items and their content in one query, one row per item
+    rows = ro_session.execute(
+        select(Playlist, PlaylistItem, Content)
+        .outerjoin(PlaylistItem, PlaylistItem.playlist_id == Playlist.id)
+        .outerjoin(Content, Content.id == PlaylistItem.content_id)
+        .where(Playlist.id == screen.current_playlist_id)
+        .order_by(PlaylistItem.order)
+    ).all()
+
+    if not rows:
+        return {
             'playlist': None,
             'items': []
-        })
+        }
+
+    # Items are built in a single pass from the joined rows
+    return {
+        'playlist': rows[0][0].to_dict(include_items=False),
+        'items': [{
+            'id': item.id,
+            'playlist_id': item.playlist_id,
+            'content_id': item.content_id,
+            'content': content.to_dict(),
+            'order': item.order,
+            'duration': item.duration_override if item.duration_override is not None else content.duration,
+            'duration_override': item.duration_override,
+            'schedule_start': item.schedule_start,
+            'schedule_end': item.schedule_end
+        } for _, item, content in rows if item is not None]
+    }
+
+@bp.route('/screen/<identifier>/events', methods=['GET'])
+def screen_events(identifier):
+    """Stream playlist changes to a screen as Server-Sent Events"""
+    screen = get_screen_by_identifier(identifier)
 
-    return jsonify({
-        'playlist': playlist.to_dict(),
-        'items': [item.to_dict() for item in playlist.items]
+    if not screen:
+        return jsonify({'error': 'Screen not found'}), 404
+
+    screen_id = screen.id
+
+    @stream_with_context
+    def stream():
+        last_payload = None
+        version = events.current_version()
+
+        timed_out = False
+
+        while True:
+            screen = ro_session.get(Screen, screen_id)
+            if not screen:
+                return
+
+            payload = screen_content_body(screen).decode()
+            if payload != last_payload:
+                last_payload = payload
+                yield f"data: {payload}\n\n"
+            elif timed_out:
+                yield ": ping\n\n"
+
+            # Don't hold a pooled connection while the stream is idle
+            ro_session.remove()
+
+            while True:
+                changed = events.wait_for_change(version, EVENT_KEEPALIVE_INTERVAL)
+                timed_out = changed == version
+                version = changed
+                # When every worker is woken, a keep-alive needs no re-check;
+                # otherwise it is how changes made in other workers are seen
+                if not timed_out or not events.wakes_all_workers():
+                    break
+                yield ": ping\n\n"
+
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
     })
 
 @bp.route('/content/<int:content_id>/download', methods=['GET'])
@@ -115,7 +307,7 @@ def download_content(content_id):
     if not os.path.exists(file_path):
         return jsonify({'error': 'File not found'}), 404
 
-    return send_file(file_path, as_attachment=True)
+    return send_upload(content.file_path, as_attachment=True, mimetype=content.mime_type)
 
 @bp.route('/content/<int:content_id>/thumbnail', methods=['GET'])
 def get_content_thumbnail(content_id):
@@ -128,18 +320,27 @@ def get_content_thumbnail(content_id):
     if content.content_type == 'webpage':
         return jsonify({'error': 'Webpages have no thumbnail'}), 400
 
+    # Thumbnails and upload filenames are unique and never rewritten,
+    # so whichever file is sent can be cached as immutable
+    thumbnail_path = content.thumbnail_path
+    if thumbnail_path and os.path.exists(os.path.join(current_app.config['UPLOAD_FOLDER'], thumbnail_path)):
+        response = send_upload(thumbnail_path, max_age=THUMBNAIL_MAX_AGE, mimetype='image/webp')
+        response.cache_control.immutable = True
+        return response
+
     file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], content.file_path)
 
     if not os.path.exists(file_path):
         return jsonify({'error': 'File not found'}), 404
 
-    # For images, serve directly (browser will resize via CSS)
-    # For videos, we'd need thumbnail generation (future enhancement)
+    # Content uploaded before thumbnails were generated: images are served
+    # directly (browser will resize via CSS)
     if content.content_type == 'image':
-        return send_file(file_path, mimetype=content.mime_type)
+        response = send_upload(content.file_path, max_age=THUMBNAIL_MAX_AGE, mimetype=content.mime_type)
+        response.cache_control.immutable = True
+        return response
     else:
-        # For videos, return placeholder for now
-        return jsonify({'error': 'Video thumbnails not yet supported'}), 400
+        return jsonify({'error': 'No thumbnail for this video'}), 400
 
 @bp.route('/upload', methods=['POST'])
 def upload_content():
@@ -152,95 +353,114 @@ def upload_content():
     if file.filename == '':
         return jsonify({'error': 'No selected file'}), 400
 
-    if not allowed_file(file.filename):
+    content_type = upload_content_type(file.filename)
+    if content_type is None:
         return jsonify({'error': 'File type not allowed'}), 400
 
     # Generate unique filename
     original_filename = secure_filename(file.filename)
     extension = original_filename.rsplit('.', 1)[1].lower()
-    unique_filename = f"{uuid.uuid4().hex}.{extension}"
-
-    file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], unique_filename)
+    upload_id = uuid.uuid4().hex
+    unique_filename = f"{upload_id}.{extension}"
 
-    # Save file with error handling
+    # Save the raw file, hashing it on the way to disk
+    temp_path = ingest.incoming_path(unique_filename)
     try:
-        file.save(file_path)
+        file_size, checksum = save_with_checksum(file.stream, temp_path)
     except Exception as e:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
         return jsonify({'error': f'Failed to save file: {str(e)}'}), 500
 
-    try:
-        # Determine content type
-        if extension in {'png', 'jpg', 'jpeg', 'gif', 'bmp'}:
-            content_type = 'image'
-        elif extension in {'mp4', 'avi', 'mov', 'webm', 'mkv'}:
-            content_type = 'video'
-        else:
-            content_type = 'unknown'
-
-        # Get file size
-        file_size = os.path.getsize(file_path)
-
-        # Get content name and duration from form data
-        # If no name provided, use filename without extension
-        name_from_form = request.form.get('name', '').strip()
-        if not name_from_form:
-            # Remove extension from filename for default name
-            name = original_filename.rsplit('.', 1)[0]
-        else:
-            name = name_from_form
-
-        duration = int(request.form.get('duration', 10))
-
-        # Create content entry
-        content = Content(
-            name=name,
-            content_type=content_type,
-            file_path=unique_filename,
-            duration=duration,
-            file_size=file_size,
-            mime_type=file.content_type
-        )
-
-        db.session.add(content)
-        db.session.commit()
-
+    # Get content name from form data
+    # If no name provided, use filename without extension
+    name = request.form.get('name', '').strip() or original_filename.rsplit('.', 1)[0]
+
+    fields = {
+        'file_path': unique_filename,
+        'name': name,
+        'duration': request.form.get('duration', 10),
+        'content_type': content_type,
+        'mime_type': file.content_type,
+        'file_size': file_size,
+        'checksum': checksum
+    }
+
+    # Thumbnails and the content row are left to a worker when one is available
+    if ingest.enqueue(upload_id, fields):
         return jsonify({
             'success': True,
-            'content': content.to_dict()
-        })
+            'status': 'pending',
+            'id': upload_id
+        }), 202
 
+    try:
+        result, status_code = ingest.process_upload(fields)
     except Exception as e:
-        # Rollback database and cleanup file on error
         db.session.rollback()
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except:
-                pass
+        ingest.discard_incoming(fields)
         return jsonify({'error': f'Failed to create content: {str(e)}'}), 500
+    return jsonify(result), status_code
+
+@bp.route('/content/<upload_id>/status', methods=['GET'])
+def upload_status(upload_id):
+    """Processing status of an upload that was queued for a worker"""
+    status = ingest.get_status(upload_id)
+    if status is None:
+        return jsonify({'error': 'Upload not found'}), 404
+    return jsonify(status)
 
 @bp.route('/content', methods=['GET'])
 def list_content():
     """List all content"""
-    content_list = Content.query.order_by(Content.created_at.desc()).all()
-    return jsonify({
-        'content': [c.to_dict() for c in content_list]
-    })
+    # Any insert, delete or edit changes the count, the highest id or the latest update
+    etag = state_etag(*ro_session.execute(
+        select(func.count(Content.id), func.max(Content.id), func.max(Content.updated_at))
+    ).one())
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    rows = list_rows(Content, Content.created_at.desc())
+    return with_etag(Response(stream_with_context(stream_json_list(
+        'content', rows
+    )), mimetype='application/json'), etag)
 
 @bp.route('/screens', methods=['GET'])
 def list_screens():
     """List all screens"""
-    screens = Screen.query.order_by(Screen.created_at.desc()).all()
-    return jsonify({
-        'screens': [s.to_dict() for s in screens]
-    })
+    # Heartbeat flushes bump updated_at too, so status changes are picked up;
+    # with Redis, heartbeats and expiries change the presence set instead
+    seen = presence.snapshot()
+    etag = state_etag(*ro_session.execute(
+        select(func.count(Screen.id), func.max(Screen.id), func.max(Screen.updated_at))
+    ).one(), len(seen), max(seen.values(), default=None))
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    rows = presence.annotate(list_rows(Screen, Screen.created_at.desc()), seen)
+    return with_etag(Response(stream_with_context(stream_json_list(
+        'screens', rows
+    )), mimetype='application/json'), etag)
 
 @bp.route('/playlist/<int:playlist_id>', methods=['GET'])
 def get_playlist(playlist_id):
     """Get playlist details with items"""
-    playlist = Playlist.query.get(playlist_id)
+    playlist = ro_session.get(Playlist, playlist_id)
 
     if not playlist:
         return jsonify({'error': 'Playlist not found'}), 404
 
-    return jsonify(playlist.to_dict())
+    # Items are only ever added or removed, and content edits bump its updated_at
+    item_state = ro_session.execute(
+        select(func.count(PlaylistItem.id), func.max(PlaylistItem.id), func.max(Content.updated_at))
+        .join(Content, Content.id == PlaylistItem.content_id)
+        .where(PlaylistItem.playlist_id == playlist_id)
+    ).one()
+    etag = state_etag(playlist.updated_at, *item_state)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    return with_etag(jsonify(playlist.to_dict()), etag)
@@ -0,0 +1,48 @@
+"""
+Small WebP previews for the admin interface
+Images are downscaled with Pillow and videos get a frame grabbed by ffmpeg,
+once at upload time, so listings never load the original media
+"""
+import os
+import subprocess
+
+from PIL import Image
+
+# Longest edge of a thumbnail, in pixels
+THUMBNAIL_SIZE = 256
+# Thumbnails live in this subfolder of the upload folder
+THUMBNAIL_DIR = 'thumbnails'
+# Seconds allowed for ffmpeg to grab a video frame
+FFMPEG_TIMEOUT = 10
+
+def generate_thumbnail(upload_folder, file_path, content_type):
+    """Write a thumbnail for an uploaded file; returns its path relative to upload_folder, or None"""
+    name = os.path.splitext(file_path)[0] + '.webp'
+    thumbnail_path = os.path.join(THUMBNAIL_DIR, name)
+    source = os.path.join(upload_folder, file_path)
+    target = os.path.join(upload_folder, thumbnail_path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+
+    try:
+        if content_type == 'image':
+            with Image.open(source) as image:
+                image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+                if image.mode not in ('RGB', 'RGBA'):
+                    image = image.convert('RGBA')
+                image.save(target, 'WEBP')
+        elif content_type == 'video':
+            subprocess.run([
+                'ffmpeg', '-y', '-loglevel', 'error',
+                '-ss', '1', '-i', source,
+                '-frames:v', '1', '-vf', f'scale={THUMBNAIL_SIZE}:-2',
+                target
+            ], check=True, timeout=FFMPEG_TIMEOUT)
+        else:
+            return None
+    except Exception as e:
+        print(f"Error generating thumbnail for {file_path}: {e}")
+        if os.path.exists(target):
+            os.remove(target)
+        return None
+
+    return thumbnail_path if os.path.exists(target) else None
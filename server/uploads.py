@@ -0,0 +1,44 @@
+"""
+Helpers for files in the upload folder
+"""
+import hashlib
+
+# Read size when hashing files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def file_checksum(path):
+    """Return the hex SHA-256 of a file, read in 1 MiB chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def save_with_checksum(stream, path):
+    """Copy an upload stream to path while hashing it; returns (size, hex SHA-256)
+
+    One pass over the upload: each chunk is read into a reused buffer, hashed
+    and written from it. Hashing needs the bytes in user space anyway, so a
+    kernel-side copy (os.sendfile) would only add a second read of the file.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    buffer = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buffer)
+    readinto = getattr(stream, 'readinto', None)
+
+    with open(path, 'wb') as f:
+        while True:
+            if readinto is not None:
+                length = readinto(buffer)
+                chunk = view[:length] if length else b''
+            else:
+                chunk = stream.read(HASH_CHUNK_SIZE)
+                length = len(chunk)
+            if not length:
+                break
+            digest.update(chunk)
+            f.write(chunk)
+            size += length
+
+    return size, digest.hexdigest()
@@ -0,0 +1,6 @@
+"""
+WSGI entry point for production servers
+Run with: gunicorn -c gunicorn.conf.py wsgi:app
+Create the schema once beforehand with: flask --app app init-db
+"""
+from app import app